@@ -0,0 +1,191 @@
+"""Log parser regression tests for tui_bitchat.py.
+
+Feeds daemon log lines (as bitchatd prints them, see test_tui_log.cpp) through
+DaemonManager._on_lines and checks the resulting ChatState and status fields.
+
+    python3 -m unittest discover -s tests -p "test_*.py"
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tui_bitchat as tb  # noqa: E402
+
+MAC = "AA:BB:CC:DD:EE:01"
+DEV = "/org/bluez/hci0/dev_AA_BB_CC_DD_EE_01"
+
+
+def log(msg: str, func: str = "fn") -> bytes:
+    return f"12:00:00.000 [SYSTEM] {func}: {msg}".encode()
+
+
+class LogParserTest(unittest.TestCase):
+    def setUp(self):
+        self.state = tb.ChatState()
+        self.mgr = tb.DaemonManager(self.state)
+
+    def feed(self, tag: str, *msgs: str):
+        self.mgr._on_lines(tag, [log(m) for m in msgs])
+
+    def texts(self, pid: str):
+        return [(m.direction, m.text, m.sender) for m in self.state.peers[pid].history]
+
+    def link_up(self):
+        # what switch_peer + a successful connect leave behind
+        self.feed("central", f"[BLUEZ][central] found {DEV} addr={MAC} (svc hit)")
+        self.state.current_peer = MAC
+        self.feed("central", f"Device connected: {DEV}", "Notifications enabled; ready")
+
+    def test_listen(self):
+        self.feed("central", "Listening on /tmp/x/central.sock")
+        self.assertEqual(self.mgr.central.sock, "/tmp/x/central.sock")
+        self.assertTrue(self.mgr.central.listening.is_set())
+        self.assertFalse(self.mgr.periph.listening.is_set())
+
+    def test_found_and_peer_lines(self):
+        self.feed(
+            "central",
+            f"[BLUEZ][central] found {DEV} addr={MAC} rssi=-60 (svc hit)",
+            "[PEER] aa:bb:cc:dd:ee:02 rssi=-70",
+            "[PEER] not-a-mac rssi=-70",
+            "[BLUEZ][central] found /org/bluez/hci0/dev_X addr=bogus (svc hit)",
+        )
+        self.assertEqual(self.mgr.dev_to_mac, {DEV: MAC})
+        self.assertEqual(
+            sorted(self.state.peers), sorted([tb.MAILBOX_ID, MAC, "aa:bb:cc:dd:ee:02"])
+        )
+
+    def test_discovery_and_adv_flags(self):
+        self.feed("central", "StartDiscovery OK")
+        self.assertTrue(self.mgr.central_discovering)
+        self.feed("central", "StopDiscovery OK")
+        self.assertFalse(self.mgr.central_discovering)
+        self.feed("peripheral", "LE advertisement registered successfully")
+        self.assertTrue(self.mgr.periph_adv)
+
+    def test_connect_ready_disconnect(self):
+        self.link_up()
+        p = self.state.peers[MAC]
+        self.assertTrue(self.mgr.central_connected)
+        self.assertTrue(self.mgr.central_ready)
+        self.assertTrue(p.is_connected)
+        self.assertEqual(self.mgr.active_mac, MAC)
+        self.assertTrue(self.mgr.is_ready())
+
+        self.feed("central", f"Disconnected ({DEV})")
+        self.assertFalse(p.is_connected)
+        self.assertFalse(self.mgr.central_connected)
+        self.assertFalse(self.mgr.central_ready)
+        self.assertIsNone(self.mgr.active_mac)
+        self.assertEqual(
+            self.texts(MAC)[-2:],
+            [
+                ("sys", "ready - notifications enabled", None),
+                ("sys", "link down", None),
+            ],
+        )
+
+    def test_hello_in_out(self):
+        self.link_up()
+        self.feed(
+            "central",
+            "[CTRL] HELLO out: user='me' caps=0x00000001",
+            "[CTRL] HELLO in: user='bob' caps=0x00000001",
+        )
+        self.assertTrue(self.mgr.psk_local)
+        self.assertTrue(self.mgr.psk_peer)
+        self.assertEqual(self.mgr.namebook, {MAC: "bob"})
+        self.assertEqual(self.state.peers[MAC].display, "bob")
+
+        self.feed("peripheral", "[CTRL] HELLO in: user='carol' caps=0x00000000")
+        self.assertEqual(self.mgr.mailbox_sender, "carol")
+        self.assertEqual(
+            self.texts(tb.MAILBOX_ID)[-1], ("sys", "(hello) peer id is 'carol'", None)
+        )
+
+    def test_recv(self):
+        self.link_up()
+        self.feed("central", "[RECV] hello there")
+        self.assertEqual(self.texts(MAC)[-1], ("in", "hello there", MAC))
+        # central RECV is mirrored into the mailbox without counting as unread
+        self.assertEqual(self.texts(tb.MAILBOX_ID)[-1], ("in", "hello there", MAC))
+        self.assertEqual(self.state.mailbox_unread, 0)
+
+        self.feed(
+            "peripheral",
+            "[CTRL] HELLO in: user='bob' caps=0x00000000",
+            "[RECV] hi from bob",
+        )
+        self.assertEqual(self.texts(tb.MAILBOX_ID)[-1], ("in", "hi from bob", "bob"))
+        self.assertEqual(self.texts(MAC)[-1], ("in", "hi from bob", "bob"))
+        self.assertEqual(self.state.mailbox_unread, 1)
+
+    def test_kex_and_sec(self):
+        self.link_up()
+        self.feed("central", "[KEX] complete.")
+        self.assertTrue(self.mgr.aead_active)
+        self.assertFalse(self.mgr.sec_warn)
+
+        self.feed(
+            "central",
+            "[SEC] AEAD decrypt failed (bad tag), dropping frame",
+            "[SEC] AEAD decrypt failed (bad tag), dropping frame",
+        )
+        self.assertTrue(self.mgr.sec_warn)
+        self.assertFalse(self.mgr.aead_active)
+        # one visible line per burst
+        self.assertEqual(
+            [t for _, t, _ in self.texts(MAC)].count(
+                "PSK mismatch: decryption failed, messages are being dropped..."
+            ),
+            1,
+        )
+
+        self.feed("central", "[KEX] no/invalid PSK")
+        self.assertTrue(self.mgr.sec_warn)
+        self.assertEqual(
+            self.texts(MAC)[-1],
+            ("sys", "KEX failed. Please check BITCHAT_PSK and retry again", None),
+        )
+
+    def test_noise_is_ignored(self):
+        self.feed("central", "something boring happened", "", "[DBG] found nothing")
+        self.assertEqual(list(self.state.peers), [tb.MAILBOX_ID])
+        self.assertEqual(self.texts(tb.MAILBOX_ID), [])
+
+    def test_recv_payload_is_not_parsed(self):
+        # peer-controlled text must not trigger other handlers
+        self.link_up()
+        payload = (
+            f"Disconnected ({DEV}) [KEX] complete. [PEER] AA:BB:CC:DD:EE:09 rssi=-1 "
+            "[CTRL] HELLO in: user='evil' caps=0x00000001"
+        )
+        self.feed("central", f"[RECV] {payload}")
+        self.assertTrue(self.mgr.central_ready)
+        self.assertFalse(self.mgr.aead_active)
+        self.assertFalse(self.mgr.psk_peer)
+        self.assertEqual(self.mgr.namebook, {})
+        self.assertNotIn("AA:BB:CC:DD:EE:09", self.state.peers)
+        self.assertEqual(self.texts(MAC)[-1], ("in", payload, MAC))
+
+    def test_hello_user_id_is_not_parsed(self):
+        # HELLO user ids are peer-controlled too: tokens inside stay inert
+        self.link_up()
+        self.feed("central", "StartDiscovery OK")
+        for user in (
+            "x[PEER] AA:BB:CC:DD:EE:09 rssi=-1",
+            "StopDiscovery OK",
+            f"Disconnected ({DEV})",
+        ):
+            self.feed("central", f"[CTRL] HELLO in: user='{user}' caps=0x00000000")
+            self.assertEqual(self.mgr.namebook[MAC], user)
+        self.assertNotIn("AA:BB:CC:DD:EE:09", self.state.peers)
+        self.assertTrue(self.mgr.central_discovering)
+        self.assertTrue(self.mgr.central_ready)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,32 +3,58 @@
 # Minimal Textual TUI that runs two bitchatd daemons (central & peripheral),
 
 from textual.containers import Horizontal, Vertical, Container
-from textual.widgets import Footer, Static, Input, ListView, ListItem, Label
+from textual.widgets import Footer, Static, Input, ListView, ListItem, Label, RichLog
 from textual.app import App, ComposeResult
 import asyncio
+import functools
+import itertools
 import os
 import re
 import signal
 import subprocess
 import shutil
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 import io
 
+try:  # optional: follow BlueZ device signals directly instead of polling peers
+    from dbus_fast import BusType, MessageType
+    from dbus_fast import Message as DBusMessage
+    from dbus_fast.aio import MessageBus
+except ImportError:
+    MessageBus = None
+
 # ======================= Domain state =======================
 
 MAILBOX_ID = "__mailbox__"
 MAILBOX_DISPLAY = "Mailbox"
+# GATT service advertised by bitchatd (SVC_UUID in include/util/constants.hpp)
+BITCHAT_SVC_UUID = "7e0f8f20-cc0b-4c6e-8a3e-5d21b2f8a9c4"
+BLUEZ_DEVICE_IFACE = "org.bluez.Device1"
+
+# per-peer ring buffer size; nothing beyond what the chat view shows is kept
+HISTORY_MAX = 300
 
 
-@dataclass
 class Message:
-    ts: datetime
-    direction: str  # "in" | "out" | "sys"
-    text: str
-    # for showing sender's id, could be user Id (if set/sent hello) or MAC
-    sender: Optional[str] = None
+    __slots__ = ("ts", "ts_str", "direction", "text", "sender")
+
+    def __init__(
+        self,
+        ts: datetime,
+        direction: str,  # "in" | "out" | "sys"
+        text: str,
+        # for showing sender's id, could be user Id (if set/sent hello) or MAC
+        sender: Optional[str] = None,
+        ts_str: Optional[str] = None,  # pre-formatted ts, if the caller has it
+    ):
+        self.ts = ts
+        self.ts_str = ts_str or ts.strftime("%H:%M:%S")
+        self.direction = direction
+        self.text = text
+        self.sender = sender
 
 
 @dataclass
@@ -36,8 +62,20 @@ class Peer:
     peer_id: str
     display: str
     is_connected: bool = False
-    history: List[Message] = field(default_factory=list)
+    history: Deque[Message] = field(default_factory=lambda: deque(maxlen=HISTORY_MAX))
     last_seen: Optional[datetime] = None
+    # lowercased display, used as the peers list sort key
+    display_lc: str = field(init=False, default="")
+    # chat view line per history entry (kept by ChatState), and their join
+    rendered: Deque[str] = field(default_factory=lambda: deque(maxlen=HISTORY_MAX))
+    rendered_joined: Optional[str] = None
+    # lines ever appended to rendered, and a counter bumped when it is rebuilt;
+    # lets the chat view append only what is new
+    rendered_count: int = 0
+    rendered_gen: int = 0
+
+    def __post_init__(self):
+        self.display_lc = self.display.lower()
 
 
 class ChatState:
@@ -45,34 +83,141 @@ class ChatState:
         self.peers: Dict[str, Peer] = {}
         self.current_peer: Optional[str] = None
         self.mailbox_unread: int = 0
+        # bumped whenever the peers list would render differently (peer added,
+        # renamed, (dis)connected, mailbox unread count)
+        self.peers_version: int = 0
+        # bumped only when the sort order can change (peer added or renamed)
+        self._order_version = 0
+        # peers_sorted() result and the _order_version it was built at
+        self._sorted_cache: List[str] = []
+        self._sorted_version = -1
+        # log batches stamp every message with the same datetime object;
+        # format it once per batch
+        self._last_ts: Optional[datetime] = None
+        self._last_ts_str = ""
         # create mailbox peer by default, and set as initial vie
         mb = Peer(peer_id=MAILBOX_ID, display=MAILBOX_DISPLAY)
         self.peers[MAILBOX_ID] = mb
         self.current_peer = MAILBOX_ID
 
-    def upsert_peer(self, peer_id: str, display: Optional[str] = None) -> Peer:
+    def upsert_peer(
+        self,
+        peer_id: str,
+        display: Optional[str] = None,
+        *,
+        ts: Optional[datetime] = None,
+    ) -> Peer:
         p = self.peers.get(peer_id)
         if not p:
             p = Peer(peer_id=peer_id, display=display or peer_id)
             self.peers[peer_id] = p
+            self.peers_version += 1
+            self._order_version += 1
             if not self.current_peer:
                 self.current_peer = peer_id
-        if display:
+        if display and display != p.display:
             p.display = display
-        p.last_seen = datetime.now()
+            p.display_lc = display.lower()
+            self.peers_version += 1
+            self._order_version += 1
+            # incoming lines without a sender show the peer display
+            p.rendered.clear()
+            p.rendered.extend(self._render(p, m) for m in p.history)
+            p.rendered_joined = None
+            p.rendered_gen += 1
+        p.last_seen = ts or datetime.now()
         return p
 
-    def add_msg(self, peer_id: str, msg: Message, *, count_unread: bool = True):
-        p = self.upsert_peer(peer_id)
+    def add_msg(
+        self,
+        peer_id: str,
+        direction: str,
+        text: str,
+        *,
+        sender: Optional[str] = None,
+        ts: Optional[datetime] = None,
+        count_unread: bool = True,
+    ) -> Message:
+        ts = ts or datetime.now()
+        return self.append_msg(
+            self.upsert_peer(peer_id, ts=ts),
+            direction,
+            text,
+            sender=sender,
+            ts=ts,
+            count_unread=count_unread,
+        )
+
+    def append_msg(
+        self,
+        p: Peer,
+        direction: str,
+        text: str,
+        *,
+        sender: Optional[str] = None,
+        ts: Optional[datetime] = None,
+        count_unread: bool = True,
+    ) -> Message:
+        """Append a new message to p; add_msg() for a Peer the caller already
+        holds, without the lookup/upsert."""
+        ts = ts or datetime.now()
+        if ts is not self._last_ts:
+            self._last_ts = ts
+            self._last_ts_str = ts.strftime("%H:%M:%S")
+        msg = Message(ts, direction, text, sender, self._last_ts_str)
+        return self.mirror_msg(p, msg, count_unread=count_unread)
+
+    def mirror_msg(
+        self, p: Peer, msg: Message, *, count_unread: bool = True
+    ) -> Message:
+        """Append an existing Message to p's history too, shared rather than
+        copied (e.g. a RECV shown under its peer and in the mailbox)."""
         p.history.append(msg)
-        if len(p.history) > 1000:
-            del p.history[:-1000]
+        p.rendered.append(self._render(p, msg))
+        p.rendered_joined = None
+        p.rendered_count += 1
         # Only count direction = in (ignore system messages like hello)
-        if peer_id == MAILBOX_ID and msg.direction == "in" and count_unread:
+        if p.peer_id == MAILBOX_ID and msg.direction == "in" and count_unread:
             self.mailbox_unread += 1
+            self.peers_version += 1
+        return msg
+
+    @staticmethod
+    def _render(p: Peer, m: Message) -> str:
+        """Chat view line for message m in p's history."""
+        if m.direction == "out":
+            who = "You"
+        elif m.direction == "sys":
+            who = "Sys"
+        else:
+            # incoming message: show sender if any, else peer display
+            who = m.sender or (p.display if p.peer_id != MAILBOX_ID else "Peer")
+        return f"[{m.ts_str}] {who}: {m.text}"
+
+    def peers_sorted(self) -> List[str]:
+        """Peer ids except the mailbox, by (display, id); re-sorted only after a
+        peer was added or renamed, not on connection or unread changes."""
+        if self._sorted_version != self._order_version:
+            self._sorted_cache = [
+                pid
+                for _, pid in sorted(
+                    (p.display_lc, pid)
+                    for pid, p in self.peers.items()
+                    if pid != MAILBOX_ID
+                )
+            ]
+            self._sorted_version = self._order_version
+        return self._sorted_cache
+
+    def set_connected(self, p: Peer, connected: bool):
+        if p.is_connected != connected:
+            p.is_connected = connected
+            self.peers_version += 1
 
     def reset_mailbox_unread(self):
-        self.mailbox_unread = 0
+        if self.mailbox_unread:
+            self.mailbox_unread = 0
+            self.peers_version += 1
 
     def get_mailbox_unread(self) -> int:
         return self.mailbox_unread
@@ -80,12 +225,22 @@ class ChatState:
 
 # ======================= Small helpers =======================
 
+# user id override, fixed for the life of the process
+_USER_ID_ENV = (os.environ.get("BITCHAT_USER_ID") or "").strip()
+# same toggle as the daemon's PEERS command: list RSSI==0 (stale) devices too
+_KEEP_ZERO_RSSI = os.environ.get("BITCHAT_KEEP_ZERO_RSSI", "")[:1] == "1"
+# environment shared by every bitchatd we spawn; DaemonProc adds role/socket
+_BASE_ENV = {
+    **os.environ,
+    "BITCHAT_TRANSPORT": "bluez",
+    "BITCHAT_LOG_LEVEL": os.environ.get("BITCHAT_LOG_LEVEL", "INFO"),
+}
+
 
 def detect_local_id(adapter: str = "hci0") -> str:
     """Return a human-readable local ID: env override -> sysfs MAC -> hciconfig -> hostname."""
-    env_id = os.environ.get("BITCHAT_USER_ID")
-    if env_id:
-        return env_id
+    if _USER_ID_ENV:
+        return _USER_ID_ENV
     sysfs = f"/sys/class/bluetooth/{adapter}/address"
     try:
         with open(sysfs, "r") as f:
@@ -103,6 +258,8 @@ def detect_local_id(adapter: str = "hci0") -> str:
         pass
     return os.uname().nodename
 
+
+@functools.lru_cache(maxsize=None)
 def _resolve_bin(name: str) -> str:
     """Pick binary path: $BITCHAT_BIN_DIR/name -> ../bin/name (relative to this file) -> name in PATH."""
     bin_dir = os.environ.get("BITCHAT_BIN_DIR")
@@ -117,19 +274,120 @@ def _resolve_bin(name: str) -> str:
     return name  # hope PATH has it
 
 
-async def run_bitchatctl(sock_path: str, *args: str) -> None:
-    """Run bitchatctl against a given AF_UNIX socket with args like ('send', 'hello')."""
-    sock_path = os.path.expanduser(sock_path)
-    cmd = [_resolve_bin("bitchatctl"), "--sock", sock_path, *args]
-    p = await asyncio.create_subprocess_exec(
-        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+async def send_ctl(sock_path: str, line: str) -> None:
+    """Write one control line (e.g. 'SEND hello') to a bitchatd AF_UNIX socket.
+
+    Same wire format as bitchatctl, without spawning it. The daemon reads a
+    single line per connection and never replies, so each command uses a
+    short-lived connection; results such as PEERS show up in the daemon log.
+    """
+    if not line or "\n" in line:
+        raise RuntimeError("control line must be non-empty and single-line")
+    try:
+        _, writer = await asyncio.open_unix_connection(sock_path)
+    except OSError as e:
+        raise RuntimeError(f"cannot reach daemon at {sock_path}: {e}") from e
+    try:
+        writer.write(line.encode() + b"\n")
+        await writer.drain()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+# ======================= Log parsing =======================
+
+# Regex from current daemon logs, unioned into one scanner: each alternative is a
+# named group and _on_log dispatches on m.lastgroup. Alternatives that can match
+# at the same position are listed in priority order (e.g. KEX ok before fail).
+# Case-sensitive, like the _RX_LOG_ANCHOR gate in front of it.
+_LOG_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    # KEX / SEC events
+    ("sec_fail", r"\[SEC\].*AEAD decrypt failed.*dropping frame"),
+    ("kex_ok", r"\[KEX\]\s+complete\."),
+    ("kex_fail", r"\[KEX\].*(?:install failed|no/invalid PSK)"),
+    ("listen", r"Listening on\s+(?P<listen_path>\S+)"),
+    # peer state
+    # the MAC is only located here, _is_mac() checks its shape
+    ("found", r"found\s+(?P<found_dev>\S+)\s+addr=(?P<found_mac>\S+)"),
+    ("connected", r"Device connected:\s+(?P<connected_dev>\S+)"),
+    (
+        "connected_prop",
+        r"Connected property became true \((?P<connected_prop_dev>\S+)\)",
+    ),
+    ("disconnected", r"Disconnected\s+\((?P<disconnected_dev>\S+)\)"),
+    (
+        "iface_removed",
+        r"InterfacesRemoved -> cleared device (?P<iface_removed_dev>\S+)",
+    ),
+    # HELLO lines are only tagged here; details are parsed by the regexes below
+    ("hello_in", r"\[CTRL\]\s+HELLO in:"),
+    ("hello_out", r"\[CTRL\]\s+HELLO out:"),
+)
+_RX_LOG = re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in _LOG_PATTERNS))
+# Literal tokens, one of which appears in every line _RX_LOG cares about.
+# (Daemon messages are fixed-case, see tests/test_tui_log.cpp)
+_LOG_SENTINELS: Tuple[str, ...] = (
+    "[KEX]",
+    "[SEC]",
+    "[CTRL]",
+    "found ",
+    "Device connected",
+    "Disconnected",
+    "Listening on",
+    "InterfacesRemoved",
+    "Connected property",
+)
+# Pure-literal lines need no regex: a substring check is enough
+_LOG_LITERALS: Tuple[Tuple[str, str], ...] = (
+    ("Notifications enabled; ready", "ready"),
+    ("StartDiscovery OK", "start_disc"),
+    ("StopDiscovery OK", "stop_disc"),
+    ("LE advertisement registered successfully", "adv_ok"),
+)
+# Line shapes with a captured tail are sliced by hand
+_RECV_TAG = "[RECV] "
+_PEER_TAG = "[PEER] "
+# Every token _on_log reacts to, in one literal alternation. Most daemon output
+# is noise; one scan rejects it instead of a dozen separate substring checks
+_RX_LOG_ANCHOR = re.compile(
+    "|".join(
+        re.escape(tok)
+        for tok in (_RECV_TAG, _PEER_TAG, *(lit for lit, _ in _LOG_LITERALS))
+        + _LOG_SENTINELS
+    )
+)
+
+
+# _RX_LOG is a wide alternation (~10us per line that reaches it), while the
+# daemon repeats the same lines (scan results, link events) over and over
+@functools.lru_cache(maxsize=1024)
+def _match_log(body: str) -> Optional[re.Match]:
+    return _RX_LOG.search(body)
+
+
+# parse user id
+_RX_CTRL_HELLO_IN = re.compile(
+    r"\[CTRL\]\s+HELLO in:\s+user='([^']*)'\s+caps=0x([0-9A-Fa-f]{8})"
+)
+_RX_CTRL_HELLO_OUT = re.compile(
+    r"\[CTRL\]\s+HELLO out:\s+user='([^']*)'\s+caps=0x([0-9A-Fa-f]{8})"
+)
+
+_HEX_COLON = b"0123456789abcdefABCDEF:"
+
+
+def _is_mac(s: str) -> bool:
+    """True for "XX:XX:XX:XX:XX:XX" (hex, either case)."""
+    return (
+        len(s) == 17
+        and s[2] == s[5] == s[8] == s[11] == s[14] == ":"
+        and s.isascii()
+        and not s.encode().translate(None, _HEX_COLON)
     )
-    out, _ = await p.communicate()
-    if p.returncode != 0:
-        msg = out.decode(errors="replace").strip()
-        raise RuntimeError(
-            f"bitchatctl {' '.join(args)} failed ({p.returncode}): {msg}"
-        )
 
 
 # ======================= Daemon manager =======================
@@ -140,26 +398,27 @@ class DaemonProc:
 
     def __init__(self, role: str, sock: str, env_extra: dict):
         self.role = role
+        # expanded once here; send_ctl() and callers use the path as-is
         self.sock = os.path.expanduser(sock)
         self.env_extra = env_extra
+        # child environment is fixed for this daemon; build it once
+        self._env = {
+            **_BASE_ENV,
+            "BITCHAT_ROLE": self.role,
+            "BITCHAT_CTL_SOCK": self.sock,
+            **(env_extra or {}),
+        }
         self.proc: Optional[asyncio.subprocess.Process] = None
+        # set once the daemon logs "Listening on <sock>"
+        self.listening = asyncio.Event()
         # File logging members
         self.log_dir: Optional[str] = None
         self.log_path: Optional[str] = None
-        self.log_fp: Optional[io.TextIOBase] = None
+        self.log_fp: Optional[io.BufferedWriter] = None
 
     async def start(self):
+        self.listening.clear()
         os.makedirs(os.path.dirname(self.sock), exist_ok=True)
-        env = os.environ.copy()
-        env.update(
-            {
-                "BITCHAT_TRANSPORT": "bluez",
-                "BITCHAT_ROLE": self.role,
-                "BITCHAT_CTL_SOCK": self.sock,
-                "BITCHAT_LOG_LEVEL": os.environ.get("BITCHAT_LOG_LEVEL", "INFO"),
-            }
-        )
-        env.update(self.env_extra or {})
         cmd = [_resolve_bin("bitchatd")]
         stdbuf = shutil.which("stdbuf")
         if stdbuf:
@@ -171,9 +430,9 @@ class DaemonProc:
         )
         os.makedirs(self.log_dir, exist_ok=True)
         self.log_path = os.path.join(self.log_dir, f"{self.role}.log")
-        # Open as line-buffered text file
+        # Raw bytes, block-buffered; DaemonManager flushes it shortly after writes
         try:
-            self.log_fp = open(self.log_path, "a", encoding="utf-8", buffering=1)
+            self.log_fp = open(self.log_path, "ab", buffering=64 * 1024)
         except Exception:
             self.log_fp = None
 
@@ -181,7 +440,7 @@ class DaemonProc:
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.STDOUT,
-            env=env,
+            env=self._env,
             preexec_fn=os.setsid,  # own process group
         )
 
@@ -200,6 +459,9 @@ class DaemonProc:
             pgid = None
 
         async def wait_done(timeout: float) -> bool:
+            # proc.wait() resolves as soon as the child is reaped
+            if proc.returncode is not None:
+                return True
             try:
                 await asyncio.wait_for(proc.wait(), timeout)
                 return True
@@ -207,12 +469,16 @@ class DaemonProc:
                 return False
 
         try:
-            # 1) Graceful via control socket
+            # 1) Graceful via control socket; if QUIT can't be delivered there
+            #    is nothing to wait for, escalate right away
+            if proc.returncode is not None:
+                return
             try:
-                await run_bitchatctl(self.sock, "quit")
+                await self.ctl("QUIT")
+                quit_sent = True
             except Exception:
-                pass
-            if await wait_done(1.5):
+                quit_sent = False
+            if await wait_done(1.5 if quit_sent else 0.05):
                 return
 
             # 2) SIGTERM group
@@ -238,6 +504,10 @@ class DaemonProc:
         finally:
             self._close_logfile()
 
+    async def ctl(self, line: str) -> None:
+        """Send one control line to this daemon."""
+        await send_ctl(self.sock, line)
+
     def _close_logfile(self):
         if self.log_fp:
             try:
@@ -250,10 +520,36 @@ class DaemonProc:
             self.log_dir = None
 
 
+# placeholder for a status field that has not been set yet
+_MISSING = object()
+
+
 class DaemonManager:
     """Starts/stops both roles; parses logs to keep status/peers; proxies SEND."""
 
+    # Attributes rendered by status_summary(); changing one invalidates its cache
+    _STATUS_FIELDS = frozenset(
+        {
+            "local_id",
+            "central_connected",
+            "central_ready",
+            "central_discovering",
+            "periph_adv",
+            "sec_warn",
+            "aead_active",
+            "psk_local",
+            "psk_peer",
+        }
+    )
+
     def __init__(self, state: ChatState):
+        # UI zones ("bar", "peers", "chat") changed since the last repaint
+        self._dirty: set[str] = set()
+        self._dirty_event = asyncio.Event()
+        # status_summary() cache, see __setattr__
+        self._status_version = 0
+        self._status_cache_key: Optional[tuple] = None
+        self._status_cache = ""
         self.state = state
         self.central = DaemonProc(
             "central", "~/.cache/bitchat-clone/central.sock", env_extra={}
@@ -262,47 +558,22 @@ class DaemonManager:
             "peripheral", "~/.cache/bitchat-clone/peripheral.sock", env_extra={}
         )
         self._tasks: List[asyncio.Task] = []
+        # pending delayed log flush, see _schedule_log_flush
+        self._log_flush_handle: Optional[asyncio.TimerHandle] = None
+        # (tag, lines) batches from the read loops; lines=None marks EOF.
+        # Bounded: a full queue stalls the readers, and the daemons block on
+        # their pipes instead of this process buffering without limit
+        self._log_q: "asyncio.Queue[Tuple[str, Optional[List[bytes]]]]" = asyncio.Queue(
+            maxsize=32
+        )
 
         # Top bar status
         self.local_id: str = detect_local_id("hci0")
-        self.user_id_env: str = (os.environ.get("BITCHAT_USER_ID") or "").strip()
         self.central_connected = False
         self.central_ready = False
         self.central_discovering = False
         self.periph_adv = False
 
-        # Regex from current daemon logs
-        ## peer state
-        self.rx_recv = re.compile(r"\[RECV\]\s+(.*)$")
-        self.rx_found = re.compile(r"found\s+(\S+)\s+addr=([0-9A-F:]{17})", re.I)
-        self.rx_connected = re.compile(r"Device connected:\s+(\S+)")
-        self.rx_connected_prop = re.compile(r"Connected property became true \((\S+)\)")
-        self.rx_disconnected_path = re.compile(r"Disconnected\s+\((\S+)\)")
-        self.rx_iface_removed = re.compile(r"InterfacesRemoved -> cleared device (\S+)")
-        self.rx_ready = re.compile(r"Notifications enabled; ready")
-        self.rx_start_disc = re.compile(r"StartDiscovery OK", re.I)
-        self.rx_stop_disc = re.compile(r"StopDiscovery OK", re.I)
-        self.rx_adv_ok = re.compile(r"LE advertisement registered successfully")
-        self.rx_listen = re.compile(r"Listening on\s+(\S+)")
-        # "bitchatctl peers" output
-        self.rx_peer_line = re.compile(
-            r"\[PEER\]\s+([0-9A-F:]{17})\s+rssi=(-?\d+)", re.I
-        )
-        self.rx_peers_empty = re.compile(r"\[PEERS\]\s+no peers found", re.I)
-
-        # parse user id
-        self.rx_ctrl_hello_in = re.compile(
-            r"\[CTRL\]\s+HELLO in:\s+user='([^']*)'\s+caps=0x([0-9A-Fa-f]{8})"
-        )
-        self.rx_ctrl_hello_out = re.compile(
-            r"\[CTRL\]\s+HELLO out:\s+user='([^']*)'\s+caps=0x([0-9A-Fa-f]{8})"
-        )
-        # KEX / SEC events from daemon logs
-        self.rx_kex_ok = re.compile(r"\[KEX\]\s+complete\.", re.I)
-        self.rx_kex_fail = re.compile(r"\[KEX\].*(install failed|no/invalid PSK)", re.I)
-        self.rx_psk_fail = re.compile(
-            r"\[SEC\].*AEAD decrypt failed.*dropping frame", re.I
-        )
         self.sec_warn: bool = False  # any security warning
         self.aead_active: bool = False  # AEAD session installed and on
 
@@ -313,6 +584,10 @@ class DaemonManager:
         self.psk_local = bool(os.environ.get("BITCHAT_PSK"))
         self.psk_peer = False
 
+        # Wall clock for log-derived timestamps, refreshed by the UI tick via
+        # tick_clock() rather than calling datetime.now() per log line
+        self._now: datetime = datetime.now()
+
         # track /org/bluez/... dev path -> MAC
         self.dev_to_mac: Dict[str, str] = {}
 
@@ -321,10 +596,34 @@ class DaemonManager:
         # which peer MAC already had a HELLO applied to UI
         self.hello_seen: set[str] = set()
         self.namebook: Dict[str, str] = {}
+        # system bus connection for BlueZ device signals (None: poll via PEERS)
+        self._bus = None
+        # BlueZ device paths seen advertising BITCHAT_SVC_UUID
+        self._bluez_svc: set[str] = set()
+
+        # _RX_LOG group / _LOG_LITERALS name -> handler(tag, match)
+        self._log_handlers = {
+            "sec_fail": self._handle_sec_fail,
+            "kex_ok": self._handle_kex_ok,
+            "kex_fail": self._handle_kex_fail,
+            "listen": self._handle_listen,
+            "found": self._handle_found,
+            "connected": self._handle_connected,
+            "connected_prop": self._handle_connected,
+            "ready": self._handle_ready,
+            "disconnected": self._handle_disconnected,
+            "iface_removed": self._handle_disconnected,
+            "start_disc": self._handle_start_disc,
+            "stop_disc": self._handle_stop_disc,
+            "adv_ok": self._handle_adv_ok,
+            "hello_in": self._handle_hello_in,
+            "hello_out": self._handle_hello_out,
+        }
 
     async def start(self):
         await self.central.start()
         await self.periph.start()
+        self._tasks.append(asyncio.create_task(self._parse_loop()))
         if self.central.proc and self.central.proc.stdout:
             self._tasks.append(
                 asyncio.create_task(
@@ -339,15 +638,22 @@ class DaemonManager:
             )
 
         # Wait until sockets exist then enable [RECV] printing on both daemons
-        await self._wait_sock(self.central.sock)
-        await self._wait_sock(self.periph.sock)
-        for s in (self.central.sock, self.periph.sock):
+        await self._wait_sock(self.central)
+        await self._wait_sock(self.periph)
+        for d in (self.central, self.periph):
             try:
-                await run_bitchatctl(s, "tail", "on")
+                await d.ctl("TAIL on")
             except Exception:
                 pass
-        # background: poll peers so UI can populate even without "found" logs
-        self._tasks.append(asyncio.create_task(self._peer_scan_loop()))
+        # Populate peers even without "found" logs: follow BlueZ if we can,
+        # otherwise poll the daemon
+        if await self._start_bluez_watch():
+            try:
+                await self.central.ctl("PEERS")  # one-shot initial sync
+            except Exception:
+                pass
+        else:
+            self._tasks.append(asyncio.create_task(self._peer_scan_loop()))
 
     async def stop(self):
         to_cancel = [t for t in self._tasks if isinstance(t, asyncio.Task)]
@@ -356,6 +662,12 @@ class DaemonManager:
         if to_cancel:
             await asyncio.gather(*to_cancel, return_exceptions=True)
         self._tasks.clear()
+        if self._log_flush_handle:
+            self._log_flush_handle.cancel()
+            self._log_flush_handle = None
+        if self._bus:
+            self._bus.disconnect()
+            self._bus = None
         await self.central.stop()
         await self.periph.stop()
         self.central_connected = False
@@ -366,261 +678,321 @@ class DaemonManager:
         self.sec_warn = False
 
     async def _read_loop(self, tag: str, stream: asyncio.StreamReader):
+        # Read in blocks and split lines ourselves: one wakeup per chunk rather
+        # than per line. `tail` carries a partial line over to the next read.
+        tail = b""
+        d = self.central if tag == "central" else self.periph
         while True:
-            line = await stream.readline()
-            if not line:
-                if tag == "central":
-                    self.central_ready = False
-                    self.central_connected = False
-                    self.central_discovering = False
-                elif tag == "peripheral":
-                    self.periph_adv = False
-                return
-            text = line.decode(errors="replace").rstrip()
-            # Tee to per-daemon log file
+            buf = await stream.read(65536)
+            # Tee the raw block to the per-daemon log file; only the copy we
+            # scan gets decoded
             try:
-                fp = self.central.log_fp if tag == "central" else self.periph.log_fp
-                if fp:
-                    fp.write(text + "\n")
+                if buf and d.log_fp:
+                    d.log_fp.write(buf)
+                    self._schedule_log_flush()
             except Exception:
                 pass
-            self._on_log(tag, text)
+            if not buf:
+                if tail:
+                    await self._log_q.put((tag, [tail]))
+                await self._log_q.put((tag, None))
+                return
+            lines = (tail + buf).split(b"\n")
+            tail = lines.pop()
+            if lines:
+                await self._log_q.put((tag, lines))
+
+    async def _parse_loop(self):
+        # Parsing is decoupled from reading: batches are handled in arrival
+        # order, yielding to the UI between batches during log bursts
+        q = self._log_q
+        while True:
+            tag, lines = await q.get()
+            if lines is None:
+                self._on_eof(tag)
+            else:
+                self._on_lines(tag, lines)
+            await asyncio.sleep(0)
+
+    def _on_eof(self, tag: str):
+        # the daemon is gone: get its last words onto disk now rather than
+        # at the next delayed flush
+        d = self.central if tag == "central" else self.periph
+        try:
+            if d.log_fp:
+                d.log_fp.flush()
+        except Exception:
+            pass
+        if tag == "central":
+            self.central_ready = False
+            self.central_connected = False
+            self.central_discovering = False
+        elif tag == "peripheral":
+            self.periph_adv = False
+
+    def _on_lines(self, tag: str, lines: List[bytes]):
+        self.tick_clock()
+        for ln in lines:
+            self._on_log(tag, ln.decode(errors="replace").rstrip())
 
     def _on_log(self, tag: str, line: str):
-        # Sec/KEX event first
-        # AEAD decrypt failed, likely PSK mismatch: frames are dropped
-        if self.rx_psk_fail.search(line):
-            self.sec_warn = True
-            self.aead_active = False
-            mac = self.active_mac or self.state.current_peer or "peer"
-            self.state.add_msg(
-                mac,
-                Message(
-                    datetime.now(),
-                    "sys",
-                    "PSK mismatch: decryption failed, messages are being dropped...",
-                ),
-            )
+        if _RX_LOG_ANCHOR.search(line) is None:
+            return
+        # [RECV] first: the payload is peer-controlled and may contain any token
+        i = line.find(_RECV_TAG)
+        if i >= 0:
+            self._handle_recv(tag, line[i + len(_RECV_TAG) :].lstrip())
             return
+        # HELLO user ids are peer-controlled too, leave those to the regex
+        ctrl = "[CTRL]" in line
+        i = -1 if ctrl else line.find(_PEER_TAG)
+        if i >= 0:
+            # "[PEER] AA:BB:CC:DD:EE:FF rssi=-60"
+            fields = line[i + len(_PEER_TAG) :].split()
+            if len(fields) >= 2 and _is_mac(fields[0]) and fields[1][:5] == "rssi=":
+                self._handle_peer_line(tag, fields[0])
+            return
+        if not ctrl:
+            for lit, name in _LOG_LITERALS:
+                if lit in line:
+                    self._log_handlers[name](tag, None)
+                    return
+        # cache on the text after the "HH:MM:SS.mmm" stamp so repeats share it
+        if line[:1].isdigit():
+            line = line.split(" ", 1)[-1]
+        m = _match_log(line)
+        if m is None:
+            return
+        handler = self._log_handlers.get(m.lastgroup)
+        if handler:
+            handler(tag, m)
+
+    def _sys_msg(self, p: Peer, text: str):
+        """Log-driven status line for p, dropped if it repeats p's last line.
+
+        Reconnect storms and per-frame errors emit the same event many times in
+        a row; one visible line (and one Message) is enough.
+        """
+        hist = p.history
+        if hist and hist[-1].direction == "sys" and hist[-1].text == text:
+            return
+        self.state.append_msg(p, "sys", text, ts=self._now)
+
+    # Sec/KEX events
+    def _handle_sec_fail(self, tag: str, m: re.Match):
+        # AEAD decrypt failed, likely PSK mismatch: frames are dropped
+        self.sec_warn = True
+        self.aead_active = False
+        mac = self.active_mac or self.state.current_peer or "peer"
+        # fires once per dropped frame; _sys_msg keeps that to a single line
+        self._sys_msg(
+            self.state.upsert_peer(mac, ts=self._now),
+            "PSK mismatch: decryption failed, messages are being dropped...",
+        )
+        self.mark_dirty("peers", "chat")
 
+    def _handle_kex_ok(self, tag: str, m: re.Match):
         # KEX complete: AEAD is enabled
-        if self.rx_kex_ok.search(line):
-            self.aead_active = True
-            self.sec_warn = False
-            mac = self.active_mac or self.state.current_peer or "peer"
-            self.state.add_msg(mac, Message(datetime.now(), "sys", "AEAD enabled"))
-            return
+        self.aead_active = True
+        self.sec_warn = False
+        mac = self.active_mac or self.state.current_peer or "peer"
+        self._sys_msg(self.state.upsert_peer(mac, ts=self._now), "AEAD enabled")
+        self.mark_dirty("peers", "chat")
 
+    def _handle_kex_fail(self, tag: str, m: re.Match):
         # KEX failed: unusable until user fixed
-        if self.rx_kex_fail.search(line):
-            self.aead_active = False
-            self.sec_warn = True
-            mac = self.active_mac or self.state.current_peer or "peer"
-            self.state.add_msg(
-                mac,
-                Message(
-                    datetime.now(),
-                    "sys",
-                    "KEX failed. Please check BITCHAT_PSK and retry again",
-                ),
+        self.aead_active = False
+        self.sec_warn = True
+        mac = self.active_mac or self.state.current_peer or "peer"
+        self._sys_msg(
+            self.state.upsert_peer(mac, ts=self._now),
+            "KEX failed. Please check BITCHAT_PSK and retry again",
+        )
+        self.mark_dirty("peers", "chat")
+
+    def _handle_listen(self, tag: str, m: re.Match):
+        # Set socket path (daemon might override)
+        d = self.central if tag == "central" else self.periph
+        d.sock = m.group("listen_path")
+        d.listening.set()
+
+    def _handle_recv(self, tag: str, text: str):
+        # Incoming payload
+        if tag == "peripheral":
+            # first sned it to mailbox, add count unread, sender from HELLO if any
+            msg = self.state.add_msg(
+                MAILBOX_ID, "in", text, sender=self.mailbox_sender, ts=self._now
             )
-            return
-
-        # 0) Set socket path (daemon might override)
-        m = self.rx_listen.search(line)
-        if m:
-            path = m.group(1)
-            if tag == "central":
-                self.central.sock = path
-            else:
-                self.periph.sock = path
-            return
-
-        # 1) Incoming payload
-        m = self.rx_recv.search(line)
-        if m:
-            text = m.group(1)
-            if tag == "peripheral":
-                # first sned it to mailbox, add count unread, sender from HELLO if any
-                self.state.add_msg(
-                    MAILBOX_ID,
-                    Message(datetime.now(), "in", text, sender=self.mailbox_sender),
+            # If we are also connected to a peer, mirror the message there too
+            if self.central_ready and self.active_mac:
+                # Prefer mailbox_sender (user id learned from HELLO) as the sender label
+                # but don't update namebook here
+                peer = self.state.peers.get(self.active_mac)
+                current_disp = peer.display if peer else self.active_mac
+                peer_sender = self.mailbox_sender or self.namebook.get(
+                    self.active_mac, current_disp
                 )
-                # If we are also connected to a peer, mirror the message there too
-                if self.central_ready and self.active_mac:
-                    # Prefer mailbox_sender (user id learned from HELLO) as the sender label
-                    # but don't update namebook here
-                    current_disp = self.state.peers.get(
-                        self.active_mac, Peer(self.active_mac, self.active_mac)
-                    ).display
-                    peer_sender = self.mailbox_sender or self.namebook.get(
-                        self.active_mac, current_disp
-                    )
 
-                    # Upgrade list display from MAC -> user id if we have it.
-                    disp = self.namebook.get(self.active_mac, current_disp)
-                    if disp != current_disp:
-                        self.state.upsert_peer(self.active_mac, display=disp)
-                    self.state.add_msg(
-                        self.active_mac,
-                        Message(datetime.now(), "in", text, sender=peer_sender),
-                    )
-            else:
-                # in some cases central will also receive messages for mailbox, mirror there too
-                pid = self.active_mac or self.state.current_peer or "peer"
-                sender = None
-                if pid and pid in self.state.peers:
-                    sender = self.state.peers[pid].display
-                self.state.add_msg(
-                    pid, Message(datetime.now(), "in", text, sender=sender)
-                )
-                self.state.add_msg(
-                    MAILBOX_ID,
-                    Message(datetime.now(), "in", text, sender=sender),
-                    count_unread=False,
+                # Upgrade list display from MAC -> user id if we have it.
+                disp = self.namebook.get(self.active_mac, current_disp)
+                peer = self.state.upsert_peer(
+                    self.active_mac, display=disp, ts=self._now
                 )
+                if peer_sender == msg.sender:
+                    self.state.mirror_msg(peer, msg)
+                else:
+                    self.state.append_msg(
+                        peer, "in", text, sender=peer_sender, ts=self._now
+                    )
+        else:
+            # in some cases central will also receive messages for mailbox, mirror there too
+            pid = self.active_mac or self.state.current_peer or "peer"
+            peer = self.state.peers.get(pid)
+            sender = peer.display if peer else None
+            if peer is None:
+                peer = self.state.upsert_peer(pid, ts=self._now)
+            msg = self.state.append_msg(peer, "in", text, sender=sender, ts=self._now)
+            mb = self.state.upsert_peer(MAILBOX_ID, ts=self._now)
+            self.state.mirror_msg(mb, msg, count_unread=False)
+        self.mark_dirty("peers", "chat")
+
+    def _handle_found(self, tag: str, m: re.Match):
+        # Discovery: remember dev_path -> MAC, create/refresh peer
+        dev_path, mac = m.group("found_dev"), m.group("found_mac")
+        if not _is_mac(mac):
             return
+        self.dev_to_mac[dev_path] = mac
+        self.state.upsert_peer(mac, display=self.namebook.get(mac, mac), ts=self._now)
+        self.mark_dirty("peers")
 
-        # 2) Discovery: remember dev_path -> MAC, create/refresh peer
-        m = self.rx_found.search(line)
-        if m:
-            dev_path, mac = m.group(1), m.group(2)
-            self.dev_to_mac[dev_path] = mac
-            self.state.upsert_peer(mac, display=self.namebook.get(mac, mac))
-            return
+    def _handle_peer_line(self, tag: str, mac: str):
         # and from explicit "bitchatctl peers" results (reliable)
-        m = self.rx_peer_line.search(line)
-        if m:
-            mac = m.group(1)
-            self.state.upsert_peer(mac, display=self.namebook.get(mac, mac))
-            return
-
-        # 3) Connected (two shapes)
-        m = self.rx_connected.search(line) or self.rx_connected_prop.search(line)
-        if m:
-            dev_path = m.group(1)
-            mac = self.dev_to_mac.get(dev_path, self.state.current_peer or "peer")
-            p = self.state.upsert_peer(mac, display=self.namebook.get(mac, mac))
-            p.is_connected = True
-            self.central_connected = True
-            self.active_mac = mac
-            self.central_ready = False
-            self.state.add_msg(
-                mac, Message(datetime.now(), "sys", "link up, resolving services...")
-            )
-            return
-
-        # 4) Ready (enable is_connected for UI too)
-        if tag == "central" and self.rx_ready.search(line):
-            self.central_ready = True
-            mac = self.state.current_peer
-            if mac and mac in self.state.peers:
-                self.state.peers[mac].is_connected = True
-                disp = self.namebook.get(mac, self.state.peers[mac].display)
-                if disp != self.state.peers[mac].display:
-                    self.state.upsert_peer(mac, display=disp)
-                    self.state.add_msg(
-                        mac,
-                        Message(
-                            datetime.now(),
-                            "sys",
-                            f"(hello) peer {mac}'s id is '{disp}'",
-                        ),
-                    )
-            self.state.add_msg(
-                mac or "peer",
-                Message(datetime.now(), "sys", "ready - notifications enabled"),
-            )
-            return
+        self.state.upsert_peer(mac, display=self.namebook.get(mac, mac), ts=self._now)
+        self.mark_dirty("peers")
+
+    def _handle_connected(self, tag: str, m: re.Match):
+        # Connected (two shapes)
+        dev_path = m.group(f"{m.lastgroup}_dev")
+        mac = self.dev_to_mac.get(dev_path, self.state.current_peer or "peer")
+        p = self.state.upsert_peer(
+            mac, display=self.namebook.get(mac, mac), ts=self._now
+        )
+        self.state.set_connected(p, True)
+        self.central_connected = True
+        self.active_mac = mac
+        self.central_ready = False
+        self._sys_msg(p, "link up, resolving services...")
+        self.mark_dirty("peers", "chat")
 
-        # 5) Disconnect (two shapes)
-        m = self.rx_disconnected_path.search(line) or self.rx_iface_removed.search(line)
-        if m:
-            dev_path = m.group(1)
-            mac = self.dev_to_mac.get(dev_path, self.state.current_peer or "peer")
-            p = self.state.upsert_peer(mac, display=self.namebook.get(mac, mac))
-            p.is_connected = False
-            self.central_connected = False
-            self.central_ready = False
-            self.active_mac = None
-            self.psk_peer = False
-            self.aead_active = False
-            self.mailbox_sender = None
-            self.hello_seen.discard(mac)
-            self.state.add_msg(mac, Message(datetime.now(), "sys", "link down"))
+    def _handle_ready(self, tag: str, m: Optional[re.Match]):
+        # Ready (enable is_connected for UI too)
+        if tag != "central":
             return
-
-        # 6) Discovery & advertising toggles (for top bar)
-        if tag == "central" and self.rx_start_disc.search(line):
+        self.central_ready = True
+        mac = self.state.current_peer
+        p = self.state.peers.get(mac) if mac else None
+        if p is not None:
+            self.state.set_connected(p, True)
+            disp = self.namebook.get(mac, p.display)
+            if disp != p.display:
+                self.state.upsert_peer(mac, display=disp, ts=self._now)
+                self.state.append_msg(
+                    p, "sys", f"(hello) peer {mac}'s id is '{disp}'", ts=self._now
+                )
+        else:
+            p = self.state.upsert_peer(mac or "peer", ts=self._now)
+        self._sys_msg(p, "ready - notifications enabled")
+        self.mark_dirty("peers", "chat")
+
+    def _handle_disconnected(self, tag: str, m: re.Match):
+        # Disconnect (two shapes)
+        dev_path = m.group(f"{m.lastgroup}_dev")
+        mac = self.dev_to_mac.get(dev_path, self.state.current_peer or "peer")
+        p = self.state.upsert_peer(
+            mac, display=self.namebook.get(mac, mac), ts=self._now
+        )
+        self.state.set_connected(p, False)
+        self.central_connected = False
+        self.central_ready = False
+        self.active_mac = None
+        self.psk_peer = False
+        self.aead_active = False
+        self.mailbox_sender = None
+        self.hello_seen.discard(mac)
+        self._sys_msg(p, "link down")
+        self.mark_dirty("peers", "chat")
+
+    # Discovery & advertising toggles (for top bar)
+    def _handle_start_disc(self, tag: str, m: Optional[re.Match]):
+        if tag == "central":
             self.central_discovering = True
-            return
-        if tag == "central" and self.rx_stop_disc.search(line):
+
+    def _handle_stop_disc(self, tag: str, m: Optional[re.Match]):
+        if tag == "central":
             self.central_discovering = False
-            return
-        if tag == "peripheral" and self.rx_adv_ok.search(line):
+
+    def _handle_adv_ok(self, tag: str, m: Optional[re.Match]):
+        if tag == "peripheral":
             self.periph_adv = True
-            return
 
-        # 7) Parse HELLO in/out and update UI
-        m = self.rx_ctrl_hello_in.search(line)
-        if m:
-            user = m.group(1)
-            caps = int(m.group(2), 16)
-            if tag == "central":
-                # hello seen on central -> update peer user Id
-                if self.active_mac:
-                    if user:
-                        self.namebook[self.active_mac] = user
-                    disp = self.namebook.get(self.active_mac, user or self.active_mac)
-                    self.state.upsert_peer(self.active_mac, display=disp)
-                    self.psk_peer = bool(caps & 0x1)  # bit0 = AEAD_PSK_SUPPORTED
-                    self.state.add_msg(
-                        self.active_mac,
-                        Message(
-                            datetime.now(),
-                            "sys",
-                            f"(hello) peer {self.active_mac}'s id is '{user or '<none>'}'",
-                        ),
-                    )
-                    self.hello_seen.add(self.active_mac)
-            else:  # tag == "peripheral"
-                # put peripheral hello to mailbox
-                self.mailbox_sender = user or None
-                self.state.add_msg(
-                    MAILBOX_ID,
-                    Message(
-                        datetime.now(),
-                        "sys",
-                        f"(hello) peer id is '{user or '<none>'}'",
-                    ),
-                )
-                if (
-                    self.central_ready
-                    and self.active_mac
-                    and self.active_mac not in self.hello_seen
-                ):
-                    if user:
-                        self.namebook[self.active_mac] = user
-                    disp = self.namebook.get(self.active_mac, user or self.active_mac)
-                    self.state.upsert_peer(self.active_mac, display=disp)
-                    self.psk_peer = bool(caps & 0x1)
-                    self.state.add_msg(
-                        self.active_mac,
-                        Message(
-                            datetime.now(),
-                            "sys",
-                            f"(hello) peer {self.active_mac}'s id is '{user or '<none>'}'",
-                        ),
-                    )
-                    self.hello_seen.add(self.active_mac)
+    def _handle_hello_in(self, tag: str, m: re.Match):
+        # Parse HELLO in and update UI
+        m = _RX_CTRL_HELLO_IN.match(m.string, m.start())
+        if not m:
             return
+        user = m.group(1)
+        caps = int(m.group(2), 16)
+        if tag == "central":
+            # hello seen on central -> update peer user Id
+            if self.active_mac:
+                if user:
+                    self.namebook[self.active_mac] = user
+                disp = self.namebook.get(self.active_mac, user or self.active_mac)
+                p = self.state.upsert_peer(self.active_mac, display=disp, ts=self._now)
+                self.psk_peer = bool(caps & 0x1)  # bit0 = AEAD_PSK_SUPPORTED
+                self.state.append_msg(
+                    p,
+                    "sys",
+                    f"(hello) peer {self.active_mac}'s id is '{user or '<none>'}'",
+                    ts=self._now,
+                )
+                self.hello_seen.add(self.active_mac)
+        else:  # tag == "peripheral"
+            # put peripheral hello to mailbox
+            self.mailbox_sender = user or None
+            self.state.add_msg(
+                MAILBOX_ID,
+                "sys",
+                f"(hello) peer id is '{user or '<none>'}'",
+                ts=self._now,
+            )
+            if (
+                self.central_ready
+                and self.active_mac
+                and self.active_mac not in self.hello_seen
+            ):
+                if user:
+                    self.namebook[self.active_mac] = user
+                disp = self.namebook.get(self.active_mac, user or self.active_mac)
+                p = self.state.upsert_peer(self.active_mac, display=disp, ts=self._now)
+                self.psk_peer = bool(caps & 0x1)
+                self.state.append_msg(
+                    p,
+                    "sys",
+                    f"(hello) peer {self.active_mac}'s id is '{user or '<none>'}'",
+                    ts=self._now,
+                )
+                self.hello_seen.add(self.active_mac)
+        self.mark_dirty("peers", "chat")
 
-        # 8) Show my PSK and peer's PSK state
-        m = self.rx_ctrl_hello_out.search(line)
-        if m and tag == "central":
+    def _handle_hello_out(self, tag: str, m: re.Match):
+        # Show my PSK and peer's PSK state
+        if tag != "central":
+            return
+        m = _RX_CTRL_HELLO_OUT.match(m.string, m.start())
+        if m:
             caps = int(m.group(2), 16)
             self.psk_local = bool(caps & 0x1)
-            return
 
     async def switch_peer(self, peer_mac: str):
         # If we're already linked to this MAC and ready, it's just a view switch.
@@ -638,15 +1010,15 @@ class DaemonManager:
         self.central_connected = False
         self.central_ready = False
         try:
-            await self._wait_sock(self.central.sock)
-            await run_bitchatctl(self.central.sock, "connect", peer_mac)
+            await self._wait_sock(self.central)
+            await self.central.ctl(f"CONNECT {peer_mac.upper()}")
         except Exception:
             pass
 
     async def disconnect(self):
         try:
-            await self._wait_sock(self.central.sock)
-            await run_bitchatctl(self.central.sock, "disconnect")
+            await self._wait_sock(self.central)
+            await self.central.ctl("DISCONNECT")
         except Exception:
             pass
         self.active_mac = None
@@ -656,12 +1028,135 @@ class DaemonManager:
     async def _peer_scan_loop(self):
         while True:
             try:
-                await self._wait_sock(self.central.sock)
-                await run_bitchatctl(self.central.sock, "peers")
+                await self._wait_sock(self.central)
+                await self.central.ctl("PEERS")
             except Exception:
                 pass
             await asyncio.sleep(10.0)  # in daemon, we cache peers for 120s
 
+    async def _start_bluez_watch(self) -> bool:
+        """Subscribe to BlueZ Device1 signals on the system bus (needs dbus-fast)."""
+        if MessageBus is None:
+            return False
+        bus = None
+        try:
+            bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+            for rule in (
+                "type='signal',sender='org.bluez',"
+                "interface='org.freedesktop.DBus.ObjectManager',member='InterfacesAdded'",
+                "type='signal',sender='org.bluez',"
+                "interface='org.freedesktop.DBus.Properties',member='PropertiesChanged',"
+                f"arg0='{BLUEZ_DEVICE_IFACE}'",
+            ):
+                await bus.call(
+                    DBusMessage(
+                        destination="org.freedesktop.DBus",
+                        path="/org/freedesktop/DBus",
+                        interface="org.freedesktop.DBus",
+                        member="AddMatch",
+                        signature="s",
+                        body=[rule],
+                    )
+                )
+            bus.add_message_handler(self._on_bluez_signal)
+            reply = await bus.call(
+                DBusMessage(
+                    destination="org.bluez",
+                    path="/",
+                    interface="org.freedesktop.DBus.ObjectManager",
+                    member="GetManagedObjects",
+                )
+            )
+            if reply.message_type == MessageType.ERROR:
+                raise RuntimeError(reply.error_name)
+        except Exception:
+            if bus:
+                bus.disconnect()
+            return False
+        self._bus = bus
+        for path, ifaces in reply.body[0].items():
+            self._note_bluez_device(path, ifaces.get(BLUEZ_DEVICE_IFACE))
+        return True
+
+    def _on_bluez_signal(self, msg) -> None:
+        if msg.message_type != MessageType.SIGNAL:
+            return
+        if msg.member == "InterfacesAdded":
+            path, ifaces = msg.body
+            self._note_bluez_device(path, ifaces.get(BLUEZ_DEVICE_IFACE))
+        elif msg.member == "PropertiesChanged" and msg.body[0] == BLUEZ_DEVICE_IFACE:
+            self._note_bluez_device(msg.path, msg.body[1])
+
+    def _note_bluez_device(self, path: str, props: Optional[dict]):
+        # same rules as the daemon's PEERS list: must advertise our service
+        # and have been heard recently (nonzero RSSI)
+        if not props:
+            return
+        uuids = props.get("UUIDs")
+        if uuids is not None:
+            if BITCHAT_SVC_UUID in (u.lower() for u in uuids.value):
+                self._bluez_svc.add(path)
+            else:
+                self._bluez_svc.discard(path)
+        if path not in self._bluez_svc:
+            return
+        rssi = props.get("RSSI")
+        if not _KEEP_ZERO_RSSI and (rssi is None or rssi.value == 0):
+            return
+        addr = props.get("Address")
+        mac = addr.value if addr is not None else self.dev_to_mac.get(path)
+        if not mac:  # /org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF
+            mac = path.rsplit("dev_", 1)[-1].replace("_", ":")
+        self.dev_to_mac[path] = mac
+        self.state.upsert_peer(mac, display=self.namebook.get(mac, mac), ts=self._now)
+        self.mark_dirty("peers")
+
+    def _schedule_log_flush(self):
+        # log files are block-buffered; push them to disk 0.5s after a write.
+        # One pending flush covers a whole burst, quiet daemons cost nothing
+        if self._log_flush_handle is None:
+            self._log_flush_handle = asyncio.get_running_loop().call_later(
+                0.5, self._flush_logs
+            )
+
+    def _flush_logs(self):
+        self._log_flush_handle = None
+        for d in (self.central, self.periph):
+            try:
+                if d.log_fp:
+                    d.log_fp.flush()
+            except Exception:
+                pass
+
+    def tick_clock(self):
+        self._now = datetime.now()
+
+    def mark_dirty(self, *zones: str):
+        """Flag UI zones ("bar", "peers", "chat") for the next wait_dirty()."""
+        self._dirty.update(zones)
+        self._dirty_event.set()
+
+    async def wait_dirty(self, delay: float = 0.05, max_delay: float = 0.2) -> set[str]:
+        """Wait for zones to be marked dirty; return and clear them.
+
+        Trailing-edge debounce: returns once no new mark arrived for `delay`,
+        or `max_delay` after the first one, so a burst costs one repaint.
+        """
+        await self._dirty_event.wait()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_delay
+        while True:
+            self._dirty_event.clear()
+            left = deadline - loop.time()
+            if left <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._dirty_event.wait(), min(delay, left))
+            except asyncio.TimeoutError:
+                break
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
     def has_selected_peer(self) -> bool:
         return bool(
             self.state.current_peer and self.state.current_peer in self.state.peers
@@ -675,9 +1170,23 @@ class DaemonManager:
             raise RuntimeError("mailbox is incoming-only")
         if not self.is_ready():
             raise RuntimeError("not connected/subscribed")
-        await run_bitchatctl(self.central.sock, "send", text)
+        await self.central.ctl(f"SEND {text}")
+
+    def __setattr__(self, name, value):
+        if name in self._STATUS_FIELDS and getattr(self, name, _MISSING) != value:
+            self._status_version += 1
+            self.mark_dirty("bar")
+        super().__setattr__(name, value)
 
     def status_summary(self) -> str:
+        # Rebuild only when a status flag, the current peer or the inbox changed
+        curr = self.state.current_peer
+        peer = self.state.peers.get(curr) if curr else None
+        inbox = self.state.get_mailbox_unread()
+        key = (self._status_version, curr, peer.display if peer else None, inbox)
+        if key == self._status_cache_key:
+            return self._status_cache
+
         c = (
             "ready"
             if self.central_ready
@@ -696,32 +1205,18 @@ class DaemonManager:
         else:
             sec = "🔓"  # plaintext (missing PSK or no KEX)
 
-        peer_disp = "-"
-        curr = self.state.current_peer
-        if curr and curr in self.state.peers:
-            peer_disp = self.state.peers[curr].display
-        myid = self.user_id_env if len(self.user_id_env) != 0 else self.local_id
-        inbox = self.state.get_mailbox_unread()
-        return f"My ID: {myid} | central: {c} | peripheral: {p} | peer: {peer_disp} | sec: {sec} | inbox:{inbox}"
+        peer_disp = peer.display if peer else "-"
+        myid = _USER_ID_ENV or self.local_id
+        self._status_cache = f"My ID: {myid} | central: {c} | peripheral: {p} | peer: {peer_disp} | sec: {sec} | inbox:{inbox}"
+        self._status_cache_key = key
+        return self._status_cache
 
-    async def _wait_sock(self, path: str, timeout: float = 3.0):
-        """Wait until the AF_UNIX control socket is listening."""
-        path = os.path.expanduser(path)
-        loop = asyncio.get_running_loop()
-        end = loop.time() + timeout
-        while loop.time() < end:
-            if os.path.exists(path):
-                try:
-                    reader, writer = await asyncio.open_unix_connection(path)
-                    writer.close()
-                    try:
-                        await writer.wait_closed()
-                    except Exception:
-                        pass
-                    return
-                except Exception:
-                    pass
-            await asyncio.sleep(0.05)
+    async def _wait_sock(self, d: DaemonProc, timeout: float = 3.0):
+        """Wait until the daemon logs that its control socket is listening."""
+        try:
+            await asyncio.wait_for(d.listening.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
 
 
 # ======================= UI =======================
@@ -734,11 +1229,20 @@ class TopBar(Static):
         super().__init__(id="top")
         self.app_ref = app_ref
         self._text = ""
+        self._stat = ""
+        self._clock = ""
 
     def refresh_bar(self):
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        stat = self.app_ref.manager.status_summary()
-        text = f" BitChat — {stat} — {now} "
+        """Re-read the status segment; the clock segment has its own tick()."""
+        self._stat = self.app_ref.manager.status_summary()
+        self._render_bar()
+
+    def tick(self):
+        self._clock = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._render_bar()
+
+    def _render_bar(self):
+        text = f" BitChat — {self._stat} — {self._clock} "
         if text != self._text:
             self._text = text
             self.update(self._text)
@@ -749,83 +1253,109 @@ class PeersPanel(Static):
         super().__init__()
         self.app_ref = app_ref
         self.list = ListView(id="peers-list")
-        self._last_snapshot: Optional[
-            Tuple[
-                Optional[str],  # current selected peer
-                int,  # mailbox unread
-                Tuple[Tuple[str, str, bool], ...],  # peers (pid, display, connected)
-            ]
-        ] = None
+        # pid -> (display, connected) as last rendered; the mailbox row stores
+        # (display, unread count) instead
+        self._last_snapshot: Dict[str, Tuple[str, object]] = {}
+        self._last_version = -1
         self.view_pids: List[str] = []
+        # pid -> row index in view_pids, rebuilt whenever the row order changes
+        self._pid_to_row: Dict[str, int] = {}
+        self._items: Dict[str, ListItem] = {}
         self._labels: Dict[str, Label] = {}
-        self._label_texts: Dict[str, str] = {}
 
     def compose(self) -> ComposeResult:
         yield Label("Peers", id="peers-title")
         yield self.list
 
-    def refresh_peers(self):
-        # put mailbox on top, others sorted by userId
-        peers_items = [
-            (pid, p) for pid, p in self.app_ref.state.peers.items() if pid != MAILBOX_ID
-        ]
-        peers_sorted = sorted(
-            peers_items, key=lambda kv: (kv[1].display.lower(), kv[0])
-        )
-        current_pid = self.app_ref.state.current_peer
-        mb_unread = self.app_ref.state.get_mailbox_unread()
-        snapshot: Tuple[Optional[str], int, Tuple[Tuple[str, str, bool], ...]] = (
-            current_pid,
-            mb_unread,
-            tuple((pid, p.display, p.is_connected) for pid, p in peers_sorted),
-        )
-        target_pids = [MAILBOX_ID] + [pid for pid, _ in peers_sorted]
+    @staticmethod
+    def _row_text(pid: str, row: Tuple[str, object]) -> str:
+        if pid == MAILBOX_ID:
+            return f"📥 Mailbox ({row[1]})" if row[1] else "📥 Mailbox"
+        dot = "● " if row[1] else "○ "
+        return f"{dot}{row[0]}"
 
-        if self.view_pids != target_pids or self._last_snapshot is None:
-            self._last_snapshot = snapshot
-            self.view_pids = target_pids
-            self._labels.clear()
-            self._label_texts.clear()
-            self.list.clear()
-            # Mailbox item
-            mb_text = f"📥 Mailbox ({mb_unread})" if mb_unread else "📥 Mailbox"
-            lbl = Label(mb_text)
-            self._labels[MAILBOX_ID] = lbl
-            self.list.append(ListItem(lbl))
-            # Peer items
-            for pid, p in peers_sorted:
-                dot = "● " if p.is_connected else "○ "
-                text = f"{dot}{p.display}"
-                lbl = Label(text)
-                self._labels[pid] = lbl
-                self._label_texts[pid] = text
-                self.list.append(ListItem(lbl))
+    def refresh_peers(self):
+        state = self.app_ref.state
+        # O(1) check first; the snapshot diff only runs after a real change
+        removed = False
+        if state.peers_version != self._last_version:
+            self._last_version = state.peers_version
+            removed = self._diff_rows()
+        # keep current selection if possible (after pending removals settle)
+        if removed:
+            self.call_after_refresh(self._sync_index)
         else:
+            self._sync_index()
+
+    def _diff_rows(self) -> bool:
+        """Apply the peer changes since the last render. True if rows were removed."""
+        state = self.app_ref.state
+        snapshot: Dict[str, Tuple[str, object]] = {
+            pid: (p.display, p.is_connected) for pid, p in state.peers.items()
+        }
+        snapshot[MAILBOX_ID] = (MAILBOX_DISPLAY, state.get_mailbox_unread())
+        old = self._last_snapshot
+        removed_rows = False
+        if snapshot != old:
+            # Diff against the last render: only added/removed/changed rows are touched
+            added = snapshot.keys() - old.keys()
+            removed = old.keys() - snapshot.keys()
+            changed = [
+                pid for pid in snapshot.keys() & old.keys() if snapshot[pid] != old[pid]
+            ]
+            if (
+                added
+                or removed
+                or any(snapshot[pid][0] != old[pid][0] for pid in changed)
+            ):
+                # put mailbox on top, others sorted by userId
+                target_pids = [MAILBOX_ID] + state.peers_sorted()
+                if target_pids != self.view_pids:
+                    texts = {pid: self._row_text(pid, snapshot[pid]) for pid in added}
+                    removed_rows = self._sync_rows(target_pids, texts)
+            for pid in changed:
+                self._labels[pid].update(self._row_text(pid, snapshot[pid]))
             self._last_snapshot = snapshot
-            # mailbox
-            mb_text = f"📥 Mailbox ({mb_unread})" if mb_unread else "📥 Mailbox"
-            if (lbl := self._labels.get(MAILBOX_ID)) and self._label_texts.get(
-                MAILBOX_ID
-            ) != mb_text:
-                lbl.update(mb_text)
-                self._label_texts[MAILBOX_ID] = mb_text
-
-            # peers
-            for pid, p in peers_sorted:
-                dot = "● " if p.is_connected else "○ "
-                text = f"{dot}{p.display}"
-                if (lbl := self._labels.get(pid)) and self._label_texts.get(
-                    pid
-                ) != text:
-                    lbl.update(text)
-                    self._label_texts[pid] = text
-
-        # keep current selection if possible
-        if current_pid in self.view_pids:
+        return removed_rows
+
+    def _sync_rows(self, target_pids: List[str], texts: Dict[str, str]) -> bool:
+        """Mount/move/remove ListItems so rows follow target_pids. True if any removed."""
+        target_set = set(target_pids)
+        dropped = [pid for pid in self.view_pids if pid not in target_set]
+        for pid in dropped:
+            self._items.pop(pid).remove()
+            del self._labels[pid]
+        kept = [pid for pid in self.view_pids if pid in target_set]
+
+        j = 0  # next kept row in current DOM order
+        for pid in target_pids:
+            if j < len(kept) and kept[j] == pid:
+                j += 1
+                continue
+            anchor = self._items[kept[j]] if j < len(kept) else None
+            item = self._items.get(pid)
+            if item is not None:
+                # reordered (display name changed): it sits further down, move it up
+                kept.remove(pid)
+                self.list.move_child(item, before=anchor)
+                continue
+            lbl = Label(texts[pid])
+            item = ListItem(lbl)
+            self._items[pid] = item
+            self._labels[pid] = lbl
+            if anchor is not None:
+                self.list.mount(item, before=anchor)
+            else:
+                self.list.append(item)
+        self.view_pids = target_pids
+        self._pid_to_row = {pid: i for i, pid in enumerate(target_pids)}
+        return bool(dropped)
+
+    def _sync_index(self):
+        new_idx = self._pid_to_row.get(self.app_ref.state.current_peer)
+        if new_idx is not None and self.list.index != new_idx:
             try:
-                new_idx = self.view_pids.index(current_pid)
-                if self.list.index != new_idx:
-                    self.list.index = new_idx
+                self.list.index = new_idx
             except Exception:
                 pass
 
@@ -840,7 +1370,7 @@ class PeersPanel(Static):
             # Switch to mailbox view only (no daemon restart); reset unread
             self.app_ref.state.current_peer = MAILBOX_ID
             self.app_ref.state.reset_mailbox_unread()
-            self.app_ref.refresh_all()
+            self.app_ref.request_refresh()
             return
         # do not reconnect if select same peer
         if pid == self.app_ref.state.current_peer and (
@@ -849,14 +1379,19 @@ class PeersPanel(Static):
             return
         # normal peer: hand over to this MAC
         await self.app_ref.manager.switch_peer(pid)
-        self.app_ref.refresh_all()
+        self.app_ref.request_refresh()
 
 
 class ChatView(Static):
     def __init__(self, app_ref: "BitChat"):
         super().__init__()
         self.app_ref = app_ref
-        self.chat_content = Static("", id="chat-content", expand=True)
+        # no max_lines: RichLog counts wrapped rows, the cap here is in messages
+        self.chat_content = RichLog(id="chat-content", wrap=True)
+        # (pid, rendered_gen, rendered_count) already written to chat_content
+        self._shown: Optional[Tuple[Optional[str], int, int]] = None
+        # messages currently held by chat_content
+        self._shown_lines = 0
 
     def compose(self) -> ComposeResult:
         yield Label("Chat", id="chat-title")
@@ -864,28 +1399,42 @@ class ChatView(Static):
 
     def refresh_chat(self):
         pid = self.app_ref.state.current_peer
-        if not pid or pid not in self.app_ref.state.peers:
-            self.chat_content.update("(no peer)")
+        p = self.app_ref.state.peers.get(pid) if pid else None
+        log = self.chat_content
+        if p is None:
+            if self._shown != (None, 0, 0):
+                self._shown = (None, 0, 0)
+                log.clear()
+                log.write("(no peer)")
             return
-        lines = []
-        for m in self.app_ref.state.peers[pid].history[-300:]:
-            t = m.ts.strftime("%H:%M:%S")
-            if m.direction == "out":
-                who = "You"
-            elif m.direction == "sys":
-                who = "Sys"
-            else:
-                # incoming message: show sender if any, else peer display
-                if m.sender:
-                    who = m.sender
-                else:
-                    who = (
-                        self.app_ref.state.peers[pid].display
-                        if pid != MAILBOX_ID
-                        else "Peer"
-                    )
-            lines.append(f"[{t}] {who}: {m.text}")
-        self.chat_content.update("\n".join(lines) or "(empty)")
+        shown = self._shown
+        key = (pid, p.rendered_gen, p.rendered_count)
+        if shown == key:
+            return
+        if shown is not None and shown[:2] == key[:2] and shown[2]:
+            # same peer, same lines: write only what was appended since
+            new = p.rendered_count - shown[2]
+            # let the view run past HISTORY_MAX by half before trimming it back
+            # with a replay, so a full history doesn't replay on every message
+            if new <= len(p.rendered) and (
+                self._shown_lines + new <= HISTORY_MAX + HISTORY_MAX // 2
+            ):
+                for line in itertools.islice(p.rendered, len(p.rendered) - new, None):
+                    log.write(line)
+                self._shown_lines += new
+                self._shown = key
+                return
+        # peer switch, re-render, too far behind or over the cap: replay the tail
+        log.clear()
+        if p.rendered:
+            # lines are formatted once, when the message is appended
+            if p.rendered_joined is None:
+                p.rendered_joined = "\n".join(p.rendered)
+            log.write(p.rendered_joined)
+        else:
+            log.write("(empty)")
+        self._shown_lines = len(p.rendered)
+        self._shown = key
 
 
 class InputBar(Static):
@@ -896,6 +1445,8 @@ class InputBar(Static):
             placeholder="Type message... (Enter to send)", id="chat-input"
         )
         self.enabled: bool = True
+        # (enabled, placeholder) last applied to the Input
+        self._last_shown: Optional[Tuple[bool, str]] = None
 
     def compose(self) -> ComposeResult:
         yield self.input
@@ -905,10 +1456,6 @@ class InputBar(Static):
         if self.app_ref.state.current_peer == MAILBOX_ID:
             enabled = False
         self.enabled = enabled
-        try:
-            self.input.disabled = not enabled
-        except Exception:
-            pass
         if enabled:
             # If PSK mismatched: notify user that text will be dropped
             if (
@@ -916,21 +1463,29 @@ class InputBar(Static):
                 and self.app_ref.manager.psk_local
                 and self.app_ref.manager.psk_peer
             ):
-                self.input.placeholder = (
-                    "Connected, but PSK mismatch (messages dropped)"
-                )
+                placeholder = "Connected, but PSK mismatch (messages dropped)"
             else:
-                self.input.placeholder = "Type message... (Enter to send)"
+                placeholder = "Type message... (Enter to send)"
 
         else:
             if self.app_ref.state.current_peer == MAILBOX_ID:
-                self.input.placeholder = "Incoming-only. Pick a peer to reply"
+                placeholder = "Incoming-only. Pick a peer to reply"
             elif not self.app_ref.manager.has_selected_peer():
-                self.input.placeholder = "Select a peer to start chatting"
+                placeholder = "Select a peer to start chatting"
             elif not self.app_ref.manager.central_ready:
-                self.input.placeholder = "Waiting for connection..."
+                placeholder = "Waiting for connection..."
             else:
-                self.input.placeholder = "Not ready"
+                placeholder = "Not ready"
+
+        # both assignments refresh the widget; only touch them on change
+        if (enabled, placeholder) == self._last_shown:
+            return
+        self._last_shown = (enabled, placeholder)
+        try:
+            self.input.disabled = not enabled
+        except Exception:
+            pass
+        self.input.placeholder = placeholder
 
     async def on_input_submitted(self, event: Input.Submitted):
         text = event.value.strip()
@@ -938,31 +1493,25 @@ class InputBar(Static):
             return
         if not self.enabled:
             pid = self.app_ref.state.current_peer or "peer"
-            self.app_ref.state.add_msg(
-                pid, Message(datetime.now(), "sys", "send blocked (not ready)")
-            )
-            self.app_ref.refresh_all()
+            self.app_ref.state.add_msg(pid, "sys", "send blocked (not ready)")
+            self.app_ref.request_refresh()
             self.input.value = ""
             return
 
         if self.app_ref.state.current_peer == MAILBOX_ID:
             # Double guard (should have been disabled already)
-            self.app_ref.state.add_msg(
-                MAILBOX_ID, Message(datetime.now(), "sys", "mailbox is incoming-only")
-            )
-            self.app_ref.refresh_all()
+            self.app_ref.state.add_msg(MAILBOX_ID, "sys", "mailbox is incoming-only")
+            self.app_ref.request_refresh()
             self.input.value = ""
             return
         pid = self.app_ref.state.current_peer or "peer"
-        self.app_ref.state.add_msg(pid, Message(datetime.now(), "out", text))
-        self.app_ref.refresh_all()
+        self.app_ref.state.add_msg(pid, "out", text)
+        self.app_ref.request_refresh()
         try:
             await self.app_ref.manager.send_text(text)
         except Exception as e:
-            self.app_ref.state.add_msg(
-                pid, Message(datetime.now(), "sys", f"send failed: {e}")
-            )
-            self.app_ref.refresh_all()
+            self.app_ref.state.add_msg(pid, "sys", f"send failed: {e}")
+            self.app_ref.request_refresh()
         finally:
             self.input.value = ""
 
@@ -1020,20 +1569,41 @@ class BitChat(App):
     async def on_mount(self):
         await self.manager.start()
         self._ui_updater = asyncio.create_task(self._refresh_loop())
+        # first paint: Mailbox row and "(no peer)" before any daemon event
+        self.request_refresh()
+        # the clock is the only thing that changes on its own
+        self._tick()
+        self.set_interval(1.0, self._tick)
+
+    def _tick(self):
+        self.manager.tick_clock()
+        self.topbar.tick()
 
     async def _refresh_loop(self):
+        # Sleep until the manager marks something dirty, then repaint only that
+        refresh = {
+            "bar": self._refresh_bar,
+            "peers": self.peers_panel.refresh_peers,
+            "chat": self.chat_view.refresh_chat,
+        }
         while True:
-            self.refresh_all()
-            await asyncio.sleep(0.25)
+            dirty = await self.manager.wait_dirty()
+            # the status line also shows the current peer and inbox count
+            if "peers" in dirty:
+                dirty.add("bar")
+            for zone in dirty:
+                refresh[zone]()
+
+    def _refresh_bar(self):
+        self.topbar.refresh_bar()
+        self._update_input_enabled()
 
     def _update_input_enabled(self):
         self.input_bar.set_enabled(self.manager.is_ready())
 
-    def refresh_all(self):
-        self.topbar.refresh_bar()
-        self.peers_panel.refresh_peers()
-        self.chat_view.refresh_chat()
-        self._update_input_enabled()
+    def request_refresh(self):
+        """Repaint everything on the next (debounced) pass of _refresh_loop."""
+        self.manager.mark_dirty("bar", "peers", "chat")
 
     async def action_quit(self) -> None:
         """Stop daemons before exit."""